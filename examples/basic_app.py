@@ -144,4 +144,6 @@ if __name__ == "__main__":
     # Uncomment the line below to generate OpenAPI schema file
     # save_openapi_schema()
 
+    # With uvicorn[standard] installed, uvicorn picks uvloop and httptools
+    # automatically where the platform supports them
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,70 @@
-from typing import Dict, Any
+import gzip
+import sys
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 import msgspec
-from starlette.responses import JSONResponse, HTMLResponse
+
+
+_DEFS_PREFIX = "#/$defs/"
+_COMPONENTS_PREFIX = "#/components/schemas/"
+
+
+def _convert_refs_to_components(
+    schema_obj: Dict[str, Any], components_schemas: Dict[str, Any]
+) -> None:
+    """Rewrite $defs references to #/components/schemas references in place.
+
+    Any $defs found are moved into ``components_schemas``.
+    """
+    stack = [schema_obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            defs = node.pop("$defs", None)
+            if defs:
+                for def_name, def_schema in defs.items():
+                    if def_name not in components_schemas:
+                        components_schemas[def_name] = def_schema
+                        stack.append(def_schema)
+
+            for key, value in node.items():
+                if (
+                    key == "$ref"
+                    and isinstance(value, str)
+                    and value.startswith(_DEFS_PREFIX)
+                ):
+                    node[key] = _COMPONENTS_PREFIX + value[len(_DEFS_PREFIX):]
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+
+
+def _build_schema(schema_type: Any) -> Tuple[bytes, bytes]:
+    """Build a type's JSON schema with its $defs split out as components.
+
+    Both parts are returned JSON-encoded, so callers decode their own copies.
+    """
+    schema_obj = msgspec.json.schema(schema_type)
+    defs: Dict[str, Any] = {}
+    _convert_refs_to_components(schema_obj, defs)
+    return msgspec.json.encode(schema_obj), msgspec.json.encode(defs)
+
+
+def _schema_for(
+    schema_type: Any, cache: Dict[Any, Tuple[bytes, bytes]]
+) -> Tuple[bytes, bytes]:
+    """Return the encoded (schema, defs) pair for a type, memoized in ``cache``."""
+    try:
+        return cache[schema_type]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable annotation; build without memoizing
+        return _build_schema(schema_type)
+
+    built = cache[schema_type] = _build_schema(schema_type)
+    return built
 
 
 def generate_openapi_schema(
@@ -28,9 +91,11 @@ def generate_openapi_schema(
     all_models = set()
     all_route_info = []
 
-    for router in app._msgspec_routers:
+    for mount_prefix, router in app._msgspec_routers:
         all_models.update(router.registered_models)
-        all_route_info.extend(router.route_info)
+        all_route_info.extend(
+            (mount_prefix, route_info) for route_info in router.route_info
+        )
 
     # Generate component schemas for all registered models
     if all_models:
@@ -52,101 +117,59 @@ def generate_openapi_schema(
         "components": {"schemas": components},
     }
 
-    # Helper function to convert refs (reuse from router)
-    def _convert_refs_to_components(
-        schema_obj: Dict[str, Any], components_schemas: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Convert $defs references to proper #/components/schemas references."""
-        if isinstance(schema_obj, dict):
-            # Handle $defs at the root level
-            if "$defs" in schema_obj:
-                for def_name, def_schema in schema_obj["$defs"].items():
-                    if def_name not in components_schemas:
-                        components_schemas[def_name] = def_schema
+    paths = schema["paths"]
+    components_schemas = schema["components"]["schemas"]
 
-                # Remove $defs and replace with $ref
-                del schema_obj["$defs"]
+    # Schemas the router could not precompute, memoized for this build only
+    built_schemas: Dict[Any, Tuple[bytes, bytes]] = {}
 
-                # If the schema has a $ref pointing to $defs, update it
-                if "$ref" in schema_obj and schema_obj["$ref"].startswith("#/$defs/"):
-                    ref_name = schema_obj["$ref"].replace("#/$defs/", "")
-                    schema_obj["$ref"] = f"#/components/schemas/{ref_name}"
+    def _resolve_schema(prebuilt, schema_type) -> Dict[str, Any]:
+        """Use the schema precomputed by the router, or build it from the type."""
+        if prebuilt is None:
+            prebuilt = _schema_for(schema_type, built_schemas)
 
-            # Recursively process nested objects
-            result = {}
-            for key, value in schema_obj.items():
-                if (
-                    key == "$ref"
-                    and isinstance(value, str)
-                    and value.startswith("#/$defs/")
-                ):
-                    # Convert $defs reference to components/schemas reference
-                    ref_name = value.replace("#/$defs/", "")
-                    result[key] = f"#/components/schemas/{ref_name}"
-                elif isinstance(value, dict):
-                    result[key] = _convert_refs_to_components(value, components_schemas)
-                elif isinstance(value, list):
-                    result[key] = [
-                        _convert_refs_to_components(item, components_schemas)
-                        if isinstance(item, dict)
-                        else item
-                        for item in value
-                    ]
-                else:
-                    result[key] = value
-            return result
-        elif isinstance(schema_obj, list):
-            return [
-                _convert_refs_to_components(item, components_schemas)
-                if isinstance(item, dict)
-                else item
-                for item in schema_obj
-            ]
-        else:
-            return schema_obj
+        # Decode fresh dicts so each generated schema can be edited independently
+        schema_bytes, defs_bytes = prebuilt
+        for def_name, def_schema in msgspec.json.decode(defs_bytes).items():
+            components_schemas.setdefault(def_name, def_schema)
+        return msgspec.json.decode(schema_bytes)
 
     # Add paths from all route info
-    for route_info in all_route_info:
-        path = route_info["path"]
-        method = route_info["method"]
-
-        if path not in schema["paths"]:
-            schema["paths"][path] = {}
-
-        operation = {
-            "summary": route_info["summary"],
-            "description": route_info["description"],
-            "operationId": route_info["handler"],
-            "tags": route_info["tags"],
-            "responses": {
-                "200": {
-                    "description": "Successful Response",
-                },
-                "422": {
-                    "description": "Validation Error",
-                    "content": {
-                        "application/json": {
-                            "schema": {
-                                "type": "object",
-                                "properties": {"detail": {"type": "string"}},
-                            }
+    for mount_prefix, route_info in all_route_info:
+        path = route_info.path
+        if mount_prefix:
+            # Mounted paths are concatenated per build; intern them as the router does
+            path = sys.intern(mount_prefix + path)
+        path_item = paths.setdefault(path, {})
+
+        responses = {
+            "200": {
+                "description": "Successful Response",
+            },
+            "422": {
+                "description": "Validation Error",
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "object",
+                            "properties": {"detail": {"type": "string"}},
                         }
-                    },
+                    }
                 },
             },
         }
+        operation = {
+            "summary": route_info.summary,
+            "description": route_info.description,
+            "operationId": route_info.handler,
+            "tags": list(route_info.tags),
+            "responses": responses,
+        }
 
         # Add request body if applicable
-        if route_info["body_param"]:
-            _, body_type = route_info["body_param"]
-
-            # Generate the schema for this specific type
-            body_schema = msgspec.json.schema(body_type)
-
-            # Convert any $defs to refs to components/schemas
-            body_schema = _convert_refs_to_components(
-                body_schema, schema["components"]["schemas"]
-            )
+        body_param = route_info.body_param
+        if body_param:
+            body_schema = _resolve_schema(route_info.body_schema, body_param[1])
 
             operation["requestBody"] = {
                 "content": {"application/json": {"schema": body_schema}},
@@ -154,35 +177,114 @@ def generate_openapi_schema(
             }
 
         # Add response schema if applicable
-        if route_info["return_type"]:
-            return_type = route_info["return_type"]
-
-            # Generate the schema for this specific return type
-            response_schema = msgspec.json.schema(return_type)
-
-            # Convert any $defs to refs to components/schemas
-            response_schema = _convert_refs_to_components(
-                response_schema, schema["components"]["schemas"]
+        return_type = route_info.return_type
+        if return_type:
+            response_schema = _resolve_schema(
+                route_info.response_schema, return_type
             )
 
-            operation["responses"]["200"]["content"] = {
+            responses["200"]["content"] = {
                 "application/json": {"schema": response_schema}
             }
 
-        schema["paths"][path][method] = operation
+        path_item[route_info.method] = operation
 
     return schema
 
 
+class _CachedResponse:
+    """ASGI endpoint that replays a response body built on the first request.
+
+    Starlette calls non-function endpoints as plain ASGI apps, so serving the
+    cached body this way skips building a Request and Response on every hit.
+    With ``compress=True`` a gzipped copy is kept for clients that accept it.
+    """
+
+    def __init__(
+        self,
+        build_body: Callable[[], bytes],
+        content_type: bytes,
+        compress: bool = False,
+    ):
+        self._build_body = build_body
+        self._content_type = content_type
+        self._compress = compress
+        self._body: Optional[bytes] = None
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._gzip_body: Optional[bytes] = None
+        self._gzip_headers: List[Tuple[bytes, bytes]] = []
+
+    def _build(self):
+        body = self._build_body()
+        self._headers = [
+            (b"content-type", self._content_type),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        if self._compress:
+            gzip_body = gzip.compress(body, compresslevel=6)
+            self._headers.append((b"vary", b"Accept-Encoding"))
+            self._gzip_headers = [
+                (b"content-type", self._content_type),
+                (b"content-length", str(len(gzip_body)).encode("latin-1")),
+                (b"content-encoding", b"gzip"),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            self._gzip_body = gzip_body
+        self._body = body
+
+    def _accepts_gzip(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name != b"accept-encoding":
+                continue
+            for coding in value.split(b","):
+                token, _, params = coding.partition(b";")
+                if token.strip().lower() != b"gzip":
+                    continue
+                quality = 1.0
+                for param in params.split(b";"):
+                    key, _, q = param.strip().partition(b"=")
+                    if key.lower() == b"q":
+                        try:
+                            quality = float(q)
+                        except ValueError:
+                            quality = 0.0
+                return quality > 0
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if self._body is None:
+            self._build()
+
+        body, headers = self._body, self._headers
+        if self._gzip_body is not None and self._accepts_gzip(scope):
+            body, headers = self._gzip_body, self._gzip_headers
+
+        # Send fresh messages; middleware such as GZipMiddleware mutates them
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": list(headers),
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
 def add_openapi_routes(
     app,
-    openapi_path: str = "/openapi.json",
-    docs_path: str = "/docs",
+    openapi_path: Optional[str] = "/openapi.json",
+    docs_path: Optional[str] = "/docs",
     title: str = "API",
     version: str = "0.1.0",
     description: str = "API Documentation",
 ):
-    """Add OpenAPI documentation routes to a Starlette application."""
+    """Add OpenAPI documentation routes to a Starlette application.
+
+    Pass ``None`` for ``openapi_path`` or ``docs_path`` to leave that route out.
+    The docs page loads the OpenAPI route, so it is only added alongside it.
+    """
+    if openapi_path is None:
+        return
 
     def generate_swagger_html() -> str:
         """Generate Swagger UI HTML."""
@@ -213,22 +315,29 @@ def add_openapi_routes(
 </html>"""
 
     # Create route handlers
-    async def openapi_endpoint(request):
-        if openapi_endpoint._cache is None:
-            openapi_endpoint._cache = generate_openapi_schema(app, title, version, description)
-
-        return JSONResponse(openapi_endpoint._cache)
-    openapi_endpoint._cache = None
-
-    async def docs_endpoint(request):
-        if docs_endpoint._cache is None:
-            docs_endpoint._cache = generate_swagger_html()
-
-        return HTMLResponse(docs_endpoint._cache)
-    docs_endpoint._cache = None
+    # Encode once with msgspec on first request; the schema is fixed after startup
+    openapi_endpoint = _CachedResponse(
+        lambda: msgspec.json.encode(
+            generate_openapi_schema(app, title, version, description)
+        ),
+        b"application/json",
+    )
 
     # Add routes to the app
     from starlette.routing import Route
 
-    app.routes.append(Route(openapi_path, openapi_endpoint))
-    app.routes.append(Route(docs_path, docs_endpoint))
+    app.routes.append(
+        Route(openapi_path, openapi_endpoint, methods=["GET"], name="openapi_endpoint")
+    )
+    if docs_path is not None:
+        # The docs page is static, so encode and compress it up front
+        docs_endpoint = _CachedResponse(
+            lambda: generate_swagger_html().encode("utf-8"),
+            b"text/html; charset=utf-8",
+            compress=True,
+        )
+        docs_endpoint._build()
+
+        app.routes.append(
+            Route(docs_path, docs_endpoint, methods=["GET"], name="docs_endpoint")
+        )
@@ -1,21 +1,69 @@
 import inspect
 import functools
+import sys
 from typing import (
     Any,
     Callable,
     Dict,
     List,
     Optional,
+    Tuple,
     get_type_hints,
     get_origin,
     get_args,
 )
 from starlette.routing import Route, Mount
 from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
+from starlette.responses import Response
 from starlette.applications import Starlette
 import msgspec
 
+from .openapi import _schema_for
+
+
+_ENCODER = msgspec.json.Encoder()
+
+_HINTS_ATTR = "_msgspec_type_hints"
+
+
+def _cached_type_hints(func: Callable) -> Dict[str, Any]:
+    """Return ``get_type_hints`` for a handler, resolving each function once.
+
+    The hints are stored on the function itself, so they are freed with it.
+    """
+    hints = getattr(func, _HINTS_ATTR, None)
+    if hints is None:
+        hints = get_type_hints(func, include_extras=True)
+        try:
+            setattr(func, _HINTS_ATTR, hints)
+        except AttributeError:
+            # Bound methods and builtins cannot carry attributes
+            pass
+    return hints
+
+
+def _json_response(content: Any, status_code: int = 200) -> Response:
+    return Response(
+        _ENCODER.encode(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+class RouteInfo(msgspec.Struct, frozen=True):
+    """Route metadata recorded at decoration time for OpenAPI generation."""
+
+    path: str
+    method: str
+    tags: Tuple[str, ...]
+    summary: str
+    description: str
+    body_param: Optional[tuple]
+    return_type: Any
+    handler: str
+    body_schema: Optional[tuple] = None
+    response_schema: Optional[tuple] = None
+
 
 class MsgspecRouter:
     """Router that handles routes with msgspec integration."""
@@ -25,10 +73,9 @@ class MsgspecRouter:
         all_routes = []
         for router in routers:
             all_routes.extend(router.routes)
-            # Update route_info paths to include mount prefix for OpenAPI
-            for route_info in router.route_info:
-                route_info["path"] = prefix + route_info["path"]
-            router._register_with_openapi(app)
+            # OpenAPI paths get the mount prefix at generation time, so the
+            # router's route_info stays reusable across apps
+            router._register_with_openapi(app, prefix)
 
         app.routes.append(Mount(prefix, routes=all_routes))
 
@@ -41,7 +88,9 @@ class MsgspecRouter:
         self.prefix = prefix
         self.tags = tags or []
         self.registered_models = set()
-        self.route_info = []
+        self.route_info: List[RouteInfo] = []
+        # Encoded schemas per type, shared by this router's routes
+        self._schemas: Dict[Any, tuple] = {}
 
     def route(
         self,
@@ -53,9 +102,15 @@ class MsgspecRouter:
     ):
         """Decorator for registering a route handler."""
 
+        if method is None:
+            method = "GET"
+        methods = [method] if isinstance(method, str) else method
+        # Drop case-insensitive duplicates while keeping the given order
+        methods_list = list(dict.fromkeys(m.upper() for m in methods))
+
         def decorator(func: Callable):
             signature = inspect.signature(func)
-            type_hints = get_type_hints(func, include_extras=True)
+            type_hints = _cached_type_hints(func)
 
             # Check for body parameter
             body_param = None
@@ -65,6 +120,10 @@ class MsgspecRouter:
                 # Register the model for OpenAPI
                 self.registered_models.add(body_type)
 
+            # The decoder is built once, on the first request, so forward
+            # references in the body model can resolve after decoration
+            body_decoder = None
+
             # Get return type for response schema
             return_type = type_hints.get("return")
             if return_type:
@@ -79,20 +138,38 @@ class MsgspecRouter:
                 elif hasattr(return_type, "__annotations__"):
                     self.registered_models.add(return_type)
 
+            # Precompute OpenAPI schemas so docs generation only merges them.
+            # Unsupported types and not-yet-defined forward references are
+            # left as None and retried when the OpenAPI schema is generated.
+            body_schema = response_schema = None
+            if body_param:
+                try:
+                    body_schema = _schema_for(body_param[1], self._schemas)
+                except (TypeError, NameError):
+                    pass
+            if return_type:
+                try:
+                    response_schema = _schema_for(return_type, self._schemas)
+                except (TypeError, NameError):
+                    pass
+
             @functools.wraps(func)
             async def endpoint(request: Request):
+                nonlocal body_decoder
                 kwargs = {}
 
                 # Handle body parameter if it exists
                 if body_param:
                     body_raw = await request.body()
+                    if body_decoder is None:
+                        body_decoder = msgspec.json.Decoder(body_param[1])
                     try:
-                        body_data = msgspec.json.decode(body_raw, type=body_param[1])
+                        body_data = body_decoder.decode(body_raw)
                         kwargs[body_param[0]] = body_data
                     except msgspec.ValidationError as e:
-                        return JSONResponse({"detail": str(e)}, status_code=422)
+                        return _json_response({"detail": str(e)}, status_code=422)
                     except msgspec.DecodeError as e:
-                        return JSONResponse({"detail": 'Error parsing JSON Body'}, status_code=400)
+                        return _json_response({"detail": 'Error parsing JSON Body'}, status_code=400)
 
                 # Call the handler function
                 result = await func(**kwargs)
@@ -100,8 +177,8 @@ class MsgspecRouter:
                 # if the wrapped function returned a Starlette Response or subclass,
                 # then use that. Otherwise, assumse JSON.
                 if not isinstance(result, Response):
-                    # Return JSONResponse with msgspec encoding
-                    return JSONResponse(msgspec.to_builtins(result))
+                    # Encode straight to JSON bytes with msgspec
+                    return _json_response(result)
 
                 return result
 
@@ -110,26 +187,36 @@ class MsgspecRouter:
             combined_tags = list(self.tags)  # Start with router tags
             if tags:
                 combined_tags.extend(tags)  # Add endpoint tags
-
-            route_info = {
-                "path": self.prefix + path,
-                "method": method.lower(),
-                "tags": combined_tags,
-                "summary": summary or func.__name__,
-                "description": description or func.__doc__ or "",
-                "body_param": body_param,
-                "return_type": return_type,
-                "handler": func.__name__,
-            }
-
-            self.route_info.append(route_info)
+            # Intern strings that are repeated across routes and used as keys
+            combined_tags = tuple(sys.intern(tag) for tag in combined_tags)
+
+            for route_method in methods_list:
+                # operationId must be unique, so qualify shared handlers
+                handler = func.__name__
+                if len(methods_list) > 1:
+                    handler = f"{handler}_{route_method.lower()}"
+
+                route_info = RouteInfo(
+                    path=sys.intern(self.prefix + path),
+                    method=sys.intern(route_method.lower()),
+                    tags=combined_tags,
+                    summary=summary or func.__name__,
+                    description=description or func.__doc__ or "",
+                    body_param=body_param,
+                    return_type=return_type,
+                    handler=handler,
+                    body_schema=body_schema,
+                    response_schema=response_schema,
+                )
+
+                self.route_info.append(route_info)
 
             # Create Starlette Route
             full_path = self.prefix + path
             if not full_path.startswith("/"):
                 full_path = "/" + full_path
 
-            route = Route(full_path, endpoint, methods=[method])
+            route = Route(full_path, endpoint, methods=methods_list)
 
             self.routes.append(route)
             return func
@@ -192,62 +279,8 @@ class MsgspecRouter:
 
         self._register_with_openapi(app)
 
-    def _register_with_openapi(self, app: Starlette):
+    def _register_with_openapi(self, app: Starlette, mount_prefix: str = ""):
         # Register this router's metadata with the app for OpenAPI generation
         if not hasattr(app, "_msgspec_routers"):
             app._msgspec_routers = []
-        app._msgspec_routers.append(self)
-
-    def _convert_refs_to_components(
-        self, schema_obj: Dict[str, Any], components_schemas: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Convert $defs references to proper #/components/schemas references."""
-        if isinstance(schema_obj, dict):
-            # Handle $defs at the root level
-            if "$defs" in schema_obj:
-                for def_name, def_schema in schema_obj["$defs"].items():
-                    if def_name not in components_schemas:
-                        components_schemas[def_name] = def_schema
-
-                # Remove $defs and replace with $ref
-                del schema_obj["$defs"]
-
-                # If the schema has a $ref pointing to $defs, update it
-                if "$ref" in schema_obj and schema_obj["$ref"].startswith("#/$defs/"):
-                    ref_name = schema_obj["$ref"].replace("#/$defs/", "")
-                    schema_obj["$ref"] = f"#/components/schemas/{ref_name}"
-
-            # Recursively process nested objects
-            result = {}
-            for key, value in schema_obj.items():
-                if (
-                    key == "$ref"
-                    and isinstance(value, str)
-                    and value.startswith("#/$defs/")
-                ):
-                    # Convert $defs reference to components/schemas reference
-                    ref_name = value.replace("#/$defs/", "")
-                    result[key] = f"#/components/schemas/{ref_name}"
-                elif isinstance(value, dict):
-                    result[key] = self._convert_refs_to_components(
-                        value, components_schemas
-                    )
-                elif isinstance(value, list):
-                    result[key] = [
-                        self._convert_refs_to_components(item, components_schemas)
-                        if isinstance(item, dict)
-                        else item
-                        for item in value
-                    ]
-                else:
-                    result[key] = value
-            return result
-        elif isinstance(schema_obj, list):
-            return [
-                self._convert_refs_to_components(item, components_schemas)
-                if isinstance(item, dict)
-                else item
-                for item in schema_obj
-            ]
-        else:
-            return schema_obj
+        app._msgspec_routers.append((mount_prefix, self))
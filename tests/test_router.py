@@ -1,10 +1,14 @@
+import gc
+import weakref
+
 import pytest
 from starlette.applications import Starlette
 from starlette.testclient import TestClient
 import msgspec
 from typing import List
 
-from starlette_msgspec import MsgspecRouter, add_openapi_routes
+from starlette_msgspec import MsgspecRouter, add_openapi_routes, generate_openapi_schema
+from starlette_msgspec import openapi as openapi_module
 
 
 class Item(msgspec.Struct):
@@ -13,6 +17,23 @@ class Item(msgspec.Struct):
     description: str = ""
 
 
+class Order(msgspec.Struct):
+    customer: "Customer"
+
+
+# Decorated before Customer exists, as when the model is defined later in a module
+forward_ref_router = MsgspecRouter()
+
+
+@forward_ref_router.post("/orders")
+async def create_order(body: Order) -> Order:
+    return body
+
+
+class Customer(msgspec.Struct):
+    name: str
+
+
 @pytest.fixture
 def app():
     app = Starlette()
@@ -459,3 +480,273 @@ def test_mount_prefix_with_individual_router_prefixes():
     
     assert v1_operation["tags"] == ["v1"]
     assert v2_operation["tags"] == ["v2"]
+
+
+def test_openapi_schema_is_cached(client, monkeypatch):
+    """Test that the OpenAPI schema is generated once and then served from cache."""
+    calls = []
+    generate = openapi_module.generate_openapi_schema
+
+    def counting_generate(*args, **kwargs):
+        calls.append(args)
+        return generate(*args, **kwargs)
+
+    monkeypatch.setattr(openapi_module, "generate_openapi_schema", counting_generate)
+
+    first = client.get("/openapi.json")
+    second = client.get("/openapi.json")
+
+    assert len(calls) == 1
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert first.content == second.content
+    assert "/items/" in second.json()["paths"]
+
+
+class Tag(msgspec.Struct):
+    label: str
+
+
+class TaggedItem(msgspec.Struct):
+    name: str
+    tags: List[Tag] = []
+
+
+def test_nested_model_refs_in_openapi():
+    """Test that nested models resolve to #/components/schemas references."""
+    app = Starlette()
+    router = MsgspecRouter()
+
+    @router.post("/tagged")
+    async def create_tagged(body: TaggedItem) -> List[TaggedItem]:
+        return [body]
+
+    router.register_routes(app)
+    add_openapi_routes(app)
+
+    client = TestClient(app)
+    schema = client.get("/openapi.json").json()
+
+    components = schema["components"]["schemas"]
+    assert "TaggedItem" in components
+    assert "Tag" in components
+    assert components["TaggedItem"]["properties"]["tags"]["items"] == {
+        "$ref": "#/components/schemas/Tag"
+    }
+
+    operation = schema["paths"]["/tagged"]["post"]
+    body_schema = operation["requestBody"]["content"]["application/json"]["schema"]
+    assert body_schema == {"$ref": "#/components/schemas/TaggedItem"}
+    response_schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+    assert response_schema["items"] == {"$ref": "#/components/schemas/TaggedItem"}
+    assert "$defs" not in body_schema
+    assert "$defs" not in response_schema
+
+
+def test_docs_route_disabled():
+    """Test that docs_path=None keeps the OpenAPI route but drops Swagger UI."""
+    app = Starlette()
+    add_openapi_routes(app, docs_path=None)
+
+    client = TestClient(app)
+    assert client.get("/openapi.json").status_code == 200
+    assert client.get("/docs").status_code == 404
+
+
+def test_openapi_routes_disabled():
+    """Test that openapi_path=None adds no documentation routes."""
+    app = Starlette()
+    add_openapi_routes(app, openapi_path=None)
+
+    client = TestClient(app)
+    assert client.get("/openapi.json").status_code == 404
+    assert client.get("/docs").status_code == 404
+
+
+def test_docs_gzip(client):
+    """Test that the Swagger UI page is served gzipped when accepted."""
+    response = client.get("/docs", headers={"accept-encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/html")
+    assert "swagger-ui" in response.text
+
+    response = client.get("/docs", headers={"accept-encoding": "identity"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert "swagger-ui" in response.text
+
+    response = client.get("/docs", headers={"accept-encoding": "br, gzip;q=0"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert "swagger-ui" in response.text
+
+    response = client.get("/docs", headers={"accept-encoding": "deflate, GZIP; q=0.5"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_router_shared_between_apps():
+    """Test that one router can be mounted into several apps at different prefixes."""
+    router = MsgspecRouter(prefix="/v1")
+
+    @router.get("/status")
+    async def get_status() -> dict:
+        return {"status": "ok"}
+
+    first_app = Starlette()
+    second_app = Starlette()
+    MsgspecRouter.mount_routers(first_app, "/api", [router])
+    MsgspecRouter.mount_routers(second_app, "/internal", [router])
+    add_openapi_routes(first_app)
+    add_openapi_routes(second_app)
+
+    first_schema = TestClient(first_app).get("/openapi.json").json()
+    second_schema = TestClient(second_app).get("/openapi.json").json()
+
+    assert list(first_schema["paths"]) == ["/api/v1/status"]
+    assert list(second_schema["paths"]) == ["/internal/v1/status"]
+    assert TestClient(second_app).get("/internal/v1/status").status_code == 200
+
+
+def test_route_with_multiple_methods():
+    """Test that one handler can serve several methods from a single decoration."""
+    app = Starlette()
+    router = MsgspecRouter()
+
+    @router.route("/ping", method=["GET", "POST"])
+    async def ping() -> dict:
+        return {"pong": True}
+
+    router.register_routes(app)
+    add_openapi_routes(app)
+
+    client = TestClient(app)
+    assert client.get("/ping").json() == {"pong": True}
+    assert client.post("/ping").json() == {"pong": True}
+    assert client.put("/ping").status_code == 405
+
+    schema = client.get("/openapi.json").json()
+    assert set(schema["paths"]["/ping"]) == {"get", "post"}
+    assert schema["paths"]["/ping"]["get"]["operationId"] == "ping_get"
+    assert schema["paths"]["/ping"]["post"]["operationId"] == "ping_post"
+
+    # Methods registered by one decoration must not share mutable tags
+    generated = generate_openapi_schema(app)
+    generated["paths"]["/ping"]["get"]["tags"].append("mutated")
+    assert generated["paths"]["/ping"]["post"]["tags"] == []
+    assert generate_openapi_schema(app)["paths"]["/ping"]["get"]["tags"] == []
+
+
+def test_forward_referenced_body_model():
+    """Test that a body model may reference a Struct defined after the route."""
+    app = Starlette()
+    forward_ref_router.register_routes(app)
+    add_openapi_routes(app)
+
+    client = TestClient(app)
+    response = client.post("/orders", json={"customer": {"name": "Ada"}})
+    assert response.status_code == 200
+    assert response.json() == {"customer": {"name": "Ada"}}
+
+    response = client.post("/orders", json={"customer": {}})
+    assert response.status_code == 422
+
+    schema = client.get("/openapi.json").json()
+    components = schema["components"]["schemas"]
+    assert components["Order"]["properties"]["customer"] == {
+        "$ref": "#/components/schemas/Customer"
+    }
+    assert "Customer" in components
+
+
+def test_generated_schemas_are_independent():
+    """Test that editing one generated schema does not leak into another."""
+
+    def make_app():
+        app = Starlette()
+        router = MsgspecRouter()
+
+        @router.post("/items")
+        async def create_item(body: TaggedItem) -> TaggedItem:
+            return body
+
+        @router.put("/items")
+        async def replace_item(body: TaggedItem) -> TaggedItem:
+            return body
+
+        router.register_routes(app)
+        return app
+
+    def body_schema(schema, method):
+        operation = schema["paths"]["/items"][method]
+        return operation["requestBody"]["content"]["application/json"]["schema"]
+
+    first_app = make_app()
+    first = generate_openapi_schema(first_app)
+    body_schema(first, "post")["description"] = "mutated"
+    first["components"]["schemas"]["Tag"]["description"] = "mutated"
+
+    assert "description" not in body_schema(first, "put")
+
+    first["paths"]["/items"]["post"]["tags"].append("mutated")
+    assert first["paths"]["/items"]["put"]["tags"] == []
+
+    for schema in (generate_openapi_schema(first_app), generate_openapi_schema(make_app())):
+        assert "description" not in body_schema(schema, "post")
+        assert "description" not in body_schema(schema, "put")
+        assert "description" not in schema["components"]["schemas"]["Tag"]
+        assert schema["paths"]["/items"]["post"]["tags"] == []
+
+
+def test_routers_are_garbage_collected():
+    """Test that apps built by a factory are freed, even through reference cycles."""
+
+    def make_app():
+        router = MsgspecRouter()
+
+        class Model(msgspec.Struct):
+            value: int
+
+            def owner(self):
+                return router
+
+        @router.post("/models")
+        async def create_model(body: Model) -> Model:
+            return body
+
+        app = Starlette()
+        router.register_routes(app)
+        add_openapi_routes(app)
+        generate_openapi_schema(app)
+        return weakref.ref(router)
+
+    refs = [make_app() for _ in range(5)]
+    gc.collect()
+
+    assert all(ref() is None for ref in refs)
+
+
+def test_route_method_normalization():
+    """Test that method=None means GET and duplicate methods collapse."""
+    app = Starlette()
+    router = MsgspecRouter()
+
+    @router.route("/echo", method=["GET", "get"])
+    async def echo() -> dict:
+        return {}
+
+    @router.route("/default", method=None)
+    async def default() -> dict:
+        return {}
+
+    router.register_routes(app)
+
+    assert [(ri.path, ri.method) for ri in router.route_info] == [
+        ("/echo", "get"),
+        ("/default", "get"),
+    ]
+    assert router.route_info[0].handler == "echo"
+
+    client = TestClient(app)
+    assert client.get("/echo").status_code == 200
+    assert client.get("/default").status_code == 200